@@ -0,0 +1,25 @@
+"""
+Shared configuration for the API and the standalone script.
+
+Loaded from the .env next to this file (whatever the working directory) or
+environment variables and validated once, so a missing setting fails at
+startup instead of deep inside an upload.
+"""
+
+from pathlib import Path
+
+from pydantic_settings import BaseSettings, SettingsConfigDict
+
+
+class Settings(BaseSettings):
+    model_config = SettingsConfigDict(
+        env_file=Path(__file__).with_name(".env"), extra="ignore", str_min_length=1
+    )
+
+    tenant_id:     str
+    client_id:     str
+    client_secret: str
+
+    azure_storage_connection_string: str
+    blob_container:  str
+    empty_pbix_name: str
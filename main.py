@@ -129,6 +129,9 @@
 """
 FastAPI app — Upload empty .pbix from Azure Blob Storage to a Power BI workspace.
 Run:  uvicorn main:app --reload
+Prod: uvicorn main:app --loop uvloop --http httptools   (or: python main.py)
+      Keep a single worker: upload status lives in process memory, so with
+      several workers GET /upload-report/{import_id} can 404 on the wrong one.
 Docs: http://localhost:8000/docs
 """
 
@@ -346,35 +349,113 @@ Docs: http://localhost:8000/docs
 #     )
 
 
+import asyncio
+import random
 import time
-import os
-import requests
+import uuid
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from typing import AsyncGenerator, Iterator
+from urllib.parse import quote
+import httpx
 import msal
-from azure.storage.blob import BlobServiceClient
-from dotenv import load_dotenv
-from fastapi import FastAPI, HTTPException
+import orjson
+import uvicorn
+from azure.core import MatchConditions
+from azure.storage.blob import BlobProperties
+from azure.storage.blob.aio import BlobClient, BlobServiceClient, ContainerClient
+from fastapi import BackgroundTasks, Depends, FastAPI, HTTPException, Request
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel, Field
-
-load_dotenv()
+from config import Settings
 
 # ── Config ────────────────────────────────────────────────────────────────────
-TENANT_ID      = os.getenv("TENANT_ID")
-CLIENT_ID      = os.getenv("CLIENT_ID")
-CLIENT_SECRET  = os.getenv("CLIENT_SECRET")
-
-AZURE_STORAGE_CONNECTION_STRING = os.getenv("AZURE_STORAGE_CONNECTION_STRING")
-BLOB_CONTAINER  = os.getenv("BLOB_CONTAINER")
-EMPTY_PBIX_NAME = os.getenv("EMPTY_PBIX_NAME")
+# Raises at import if anything is missing, so a misconfigured app never starts
+settings = Settings()
 
 POWERBI_SCOPE = ["https://analysis.windows.net/powerbi/api/.default"]
 POWERBI_API   = "https://api.powerbi.com/v1.0/myorg"
+
+PBIX_CONTENT_TYPE = "application/vnd.ms-powerbi.pbix"
+PBIX_CHUNK_SIZE   = 4 * 1024 * 1024
+
+# HTML5 form encoding for the multipart filename, as httpx applies it: control
+# characters would otherwise let a report name inject part headers
+FILENAME_ESCAPES = str.maketrans(
+    {'"': "%22", "\\": "\\\\", **{chr(c): f"%{c:02X}" for c in range(0x20)}}
+)
+
+# Upstream error bodies can be large HTML pages from auth proxies; only echo the head
+ERROR_DETAIL_LIMIT = 512
+
+# Blob → upload pipeline on a cache miss: chunks buffered between the two
+PBIX_PIPELINE_SLOTS = 8
+
+# Range GETs in flight at once when the template has to be downloaded
+PBIX_DOWNLOAD_CONCURRENCY = 8
+
+# Batch uploads: reports accepted per request, and uploads / status pollers
+# in flight at once so a batch can't flood Power BI
+BATCH_MAX_REPORTS        = 50
+BATCH_UPLOAD_CONCURRENCY = 8
+
+# Refresh the access token this many seconds before Entra ID says it expires
+TOKEN_REFRESH_MARGIN = 300
 # ─────────────────────────────────────────────────────────────────────────────
 
+# Client-credential tokens live ~1h; keep one MSAL app per process and the
+# current (token, monotonic expiry) so warm requests skip MSAL entirely. The
+# app is built on first use because its constructor calls
+# login.microsoftonline.com, and an outage there must not stop the app booting.
+_MSAL_APP: msal.ConfidentialClientApplication | None = None
+_ACCESS_TOKEN: tuple[str, float] | None = None
+_TOKEN_LOCK = asyncio.Lock()
+
+# (etag, content) of the template; it rarely changes, so serve it from memory
+# and only re-download when the blob's etag moves.
+_PBIX_CACHE: tuple[str, bytes] | None = None
+_PBIX_LOCK = asyncio.Lock()
+
+# import_id -> latest UploadResponse, filled in by the background poller. This
+# lives in process memory, so with several workers a status lookup has to land
+# on the worker that accepted the upload (sticky sessions / single worker).
+UPLOAD_RESULTS_MAX = 1000
+_UPLOAD_RESULTS: OrderedDict[str, "UploadResponse"] = OrderedDict()
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # One pooled HTTP/2 client and one async blob client per process, shared by
+    # every request. Blob GETs are capped at PBIX_CHUNK_SIZE so the template is
+    # fetched as ranges that can be forwarded to Power BI as they arrive.
+    async with httpx.AsyncClient(
+        http2=True,
+        timeout=httpx.Timeout(60.0),
+        limits=httpx.Limits(max_keepalive_connections=20, keepalive_expiry=60),
+    ) as http_client, BlobServiceClient.from_connection_string(
+        settings.azure_storage_connection_string,
+        max_single_get_size=PBIX_CHUNK_SIZE,
+        max_chunk_get_size=PBIX_CHUNK_SIZE,
+    ) as blob_service:
+        app.state.http_client = http_client
+        app.state.blob_container = blob_service.get_container_client(settings.blob_container)
+        yield
+
+
+def get_http_client(request: Request) -> httpx.AsyncClient:
+    return request.app.state.http_client
+
+
+def get_blob_container(request: Request) -> ContainerClient:
+    return request.app.state.blob_container
+
+
 app = FastAPI(
     title="Power BI Report Uploader",
     description="Downloads an empty .pbix from Azure Blob Storage and uploads it to a Power BI workspace.",
     version="1.0.0",
+    lifespan=lifespan,
 )
 
 # ── ✅ CORS FIX ───────────────────────────────────────────────────────────────
@@ -406,36 +487,75 @@ class UploadResponse(BaseModel):
     report_name:  str
     report_id:    str | None = None
     dataset_id:   str | None = None
-# ─────────────────────────────────────────────────────────────────────────────
+    import_id:    str | None = None
 
 
-def get_access_token() -> str:
-    app_client = msal.ConfidentialClientApplication(
-        CLIENT_ID,
-        authority=f"https://login.microsoftonline.com/{TENANT_ID}",
-        client_credential=CLIENT_SECRET,
-    )
+class BatchUploadRequest(BaseModel):
+    reports: list[UploadRequest] = Field(..., max_length=BATCH_MAX_REPORTS,
+                                         description="Reports to upload concurrently")
 
-    result = app_client.acquire_token_for_client(scopes=POWERBI_SCOPE)
 
-    if "access_token" not in result:
-        raise HTTPException(
-            status_code=500,
-            detail=f"Token error: {result.get('error_description')}"
-        )
+class BatchUploadResponse(BaseModel):
+    results: list[UploadResponse]
+# ─────────────────────────────────────────────────────────────────────────────
 
-    return result["access_token"]
 
+def acquire_token_for_client() -> dict:
+    """Blocking MSAL call (run in the threadpool); builds the app on first use."""
+    global _MSAL_APP
 
-def download_empty_pbix() -> bytes:
-    try:
-        blob_service = BlobServiceClient.from_connection_string(
-            AZURE_STORAGE_CONNECTION_STRING
+    if _MSAL_APP is None:
+        _MSAL_APP = msal.ConfidentialClientApplication(
+            settings.client_id,
+            authority=f"https://login.microsoftonline.com/{settings.tenant_id}",
+            client_credential=settings.client_secret,
         )
-        container = blob_service.get_container_client(BLOB_CONTAINER)
-        blob = container.get_blob_client(EMPTY_PBIX_NAME)
 
-        return blob.download_blob().readall()
+    return _MSAL_APP.acquire_token_for_client(scopes=POWERBI_SCOPE)
+
+
+async def get_access_token() -> str:
+    global _ACCESS_TOKEN
+
+    if _ACCESS_TOKEN and _ACCESS_TOKEN[1] > time.monotonic():
+        return _ACCESS_TOKEN[0]
+
+    # Only refreshes take the lock, so concurrent cold requests share one call
+    async with _TOKEN_LOCK:
+        if _ACCESS_TOKEN and _ACCESS_TOKEN[1] > time.monotonic():
+            return _ACCESS_TOKEN[0]
+
+        try:
+            result = await run_in_threadpool(acquire_token_for_client)
+        except Exception as e:
+            raise HTTPException(
+                status_code=500,
+                detail=f"Token error: {str(e)}"
+            )
+
+        if "access_token" not in result:
+            raise HTTPException(
+                status_code=500,
+                detail=f"Token error: {result.get('error_description')}"
+            )
+
+        expires_at = time.monotonic() + result.get("expires_in", 0) - TOKEN_REFRESH_MARGIN
+        _ACCESS_TOKEN = (result["access_token"], expires_at)
+
+        return result["access_token"]
+
+
+async def open_empty_pbix(
+    container: ContainerClient,
+) -> tuple[int, bytes | AsyncGenerator[bytes, None]]:
+    """Return (size, content) of the template.
+
+    Content is the cached bytes while the blob's etag is unchanged; on a miss it
+    is a stream of chunks that can be uploaded while the rest still downloads.
+    """
+    try:
+        blob = container.get_blob_client(settings.empty_pbix_name)
+        props = await blob.get_blob_properties()
 
     except Exception as e:
         raise HTTPException(
@@ -443,98 +563,159 @@ def download_empty_pbix() -> bytes:
             detail=f"Blob download failed: {str(e)}"
         )
 
+    if _PBIX_CACHE and _PBIX_CACHE[0] == props.etag:
+        return len(_PBIX_CACHE[1]), _PBIX_CACHE[1]
 
-def fetch_report_id(headers: dict, workspace_id: str, report_name: str) -> str | None:
-    reports_url = f"{POWERBI_API}/groups/{workspace_id}/reports"
-
-    for _ in range(8):
-        time.sleep(3)
-        resp = requests.get(reports_url, headers=headers)
+    return props.size, stream_empty_pbix(blob, props)
 
-        if resp.ok:
-            for report in resp.json().get("value", []):
-                if report["name"].lower() == report_name.lower():
-                    return report["id"]
-
-    return None
 
+async def download_pbix_range(
+    blob: BlobClient, etag: str, offset: int, length: int, semaphore: asyncio.Semaphore
+) -> bytes:
+    async with semaphore:
+        # Pin every range to the same etag so a template swapped mid-download
+        # fails instead of being stitched together from two versions
+        stream = await blob.download_blob(
+            offset=offset,
+            length=length,
+            etag=etag,
+            match_condition=MatchConditions.IfNotModified,
+        )
+        return await stream.readall()
 
-@app.get("/", tags=["Health"])
-def root():
-    return {
-        "status": "ok",
-        "message": "Power BI Report Uploader is running. Visit /docs to use the API."
-    }
 
+async def fill_pbix_pipeline(blob: BlobClient, props: BlobProperties, queue: asyncio.Queue) -> None:
+    """Producer: download ranges in parallel and hand them to the upload in order, then cache them."""
+    global _PBIX_CACHE
 
-@app.post("/upload-report", response_model=UploadResponse, tags=["Power BI"])
-def upload_report(body: UploadRequest):
+    semaphore = asyncio.Semaphore(PBIX_DOWNLOAD_CONCURRENCY)
+    ranges = [
+        asyncio.create_task(download_pbix_range(
+            blob, props.etag, offset, min(PBIX_CHUNK_SIZE, props.size - offset), semaphore
+        ))
+        for offset in range(0, props.size, PBIX_CHUNK_SIZE)
+    ]
 
-    # 1️⃣ Authenticate
-    access_token = get_access_token()
-    headers = {"Authorization": f"Bearer {access_token}"}
+    chunks = []
+    try:
+        for pending in ranges:
+            chunk = await pending
+            chunks.append(chunk)
+            await queue.put(chunk)
 
-    # 2️⃣ Download template from Blob Storage
-    pbix_bytes = download_empty_pbix()
+        _PBIX_CACHE = (props.etag, b"".join(chunks))
+        await queue.put(None)
 
-    # 3️⃣ Upload to Power BI (Import API)
-    upload_url = (
-        f"{POWERBI_API}/groups/{body.workspace_id}/imports"
-        f"?datasetDisplayName={body.report_name}"
-        "&nameConflict=CreateOrOverwrite"
-    )
-
-    files = {
-        "file": (
-            f"{body.report_name}.pbix",
-            pbix_bytes,
-            "application/vnd.ms-powerbi.pbix"
-        )
+    except Exception as e:
+        await queue.put(e)
+
+    finally:
+        for pending in ranges:
+            pending.cancel()
+        await asyncio.gather(*ranges, return_exceptions=True)
+
+
+async def stream_empty_pbix(
+    blob: BlobClient, props: BlobProperties
+) -> AsyncGenerator[bytes, None]:
+    """Consumer: yield the template into the upload body on a cache miss.
+
+    Nothing is locked or downloaded until the upload starts reading, and
+    closing the stream cancels the download, so a failed upload never leaves
+    the lock held; a slow upload just applies backpressure to the download.
+    Concurrent misses wait on the lock and are then served from the cache the
+    first request filled.
+    """
+    async with _PBIX_LOCK:
+        if _PBIX_CACHE and _PBIX_CACHE[0] == props.etag:
+            yield _PBIX_CACHE[1]
+            return
+
+        queue = asyncio.Queue(maxsize=PBIX_PIPELINE_SLOTS)
+        producer = asyncio.create_task(fill_pbix_pipeline(blob, props, queue))
+        try:
+            while (item := await queue.get()) is not None:
+                if isinstance(item, Exception):
+                    raise HTTPException(
+                        status_code=500,
+                        detail=f"Blob download failed: {str(item)}"
+                    )
+                yield item
+        finally:
+            producer.cancel()
+            await asyncio.wait([producer])
+
+
+def multipart_file_stream(
+    filename: str, content_type: str, size: int, chunks: bytes | AsyncGenerator[bytes, None]
+) -> tuple[dict, AsyncGenerator[bytes, None]]:
+    """Build a single-file multipart/form-data body that streams `chunks`."""
+    boundary = uuid.uuid4().hex
+    quoted_name = filename.translate(FILENAME_ESCAPES)
+    head = (
+        f"--{boundary}\r\n"
+        f'Content-Disposition: form-data; name="file"; filename="{quoted_name}"\r\n'
+        f"Content-Type: {content_type}\r\n\r\n"
+    ).encode()
+    tail = f"\r\n--{boundary}--\r\n".encode()
+
+    async def body() -> AsyncGenerator[bytes, None]:
+        yield head
+        if isinstance(chunks, bytes):
+            yield chunks
+        else:
+            try:
+                async for chunk in chunks:
+                    yield chunk
+            finally:
+                await chunks.aclose()
+        yield tail
+
+    headers = {
+        "Content-Type": f"multipart/form-data; boundary={boundary}",
+        "Content-Length": str(len(head) + size + len(tail)),
     }
+    return headers, body()
 
-    resp = requests.post(upload_url, headers=headers, files=files)
 
-    if resp.status_code not in (200, 201, 202):
-        raise HTTPException(status_code=resp.status_code, detail=resp.text)
+def error_detail(resp: httpx.Response) -> str:
+    return resp.content[:ERROR_DETAIL_LIMIT].decode("utf-8", "replace")
 
-    import_data = resp.json()
-    import_id = import_data.get("id")
 
-    if not import_id:
-        raise HTTPException(
-            status_code=500,
-            detail="Import ID not returned from Power BI."
-        )
+def poll_delays(attempts: int) -> Iterator[float]:
+    """Exponential backoff with jitter: ~0.5s, 0.85s, 1.4s, ... capped at 5s."""
+    delay = 0.5
+    for _ in range(attempts):
+        yield delay + random.uniform(0, delay * 0.25)
+        delay = min(delay * 1.7, 5.0)
 
-    dataset_id = None
-    report_id = None
 
-    import_status_url = (
-        f"{POWERBI_API}/groups/{body.workspace_id}/imports/{import_id}"
-    )
+async def fetch_import_result(
+    client: httpx.AsyncClient, headers: dict, workspace_id: str, import_id: str
+) -> tuple[str | None, str | None]:
+    """Poll the import until it succeeds; returns (dataset_id, report_id)."""
+    import_status_url = f"{POWERBI_API}/groups/{workspace_id}/imports/{import_id}"
 
-    for _ in range(15):
-        time.sleep(3)
+    # ~50s worst case, close to the old fixed 15 x 3s budget
+    for delay in poll_delays(13):
+        await asyncio.sleep(delay)
 
-        status_resp = requests.get(import_status_url, headers=headers)
+        status_resp = await client.get(import_status_url, headers=headers)
 
-        if not status_resp.ok:
+        if not status_resp.is_success:
             continue
 
-        status_json = status_resp.json()
+        status_json = orjson.loads(status_resp.content)
         state = status_json.get("importState")
 
         if state == "Succeeded":
             datasets = status_json.get("datasets", [])
             reports = status_json.get("reports", [])
 
-            if datasets:
-                dataset_id = datasets[0].get("id")
+            dataset_id = datasets[0].get("id") if datasets else None
+            report_id = reports[0].get("id") if reports else None
 
-            if reports:
-                report_id = reports[0].get("id")
-
-            break
+            return dataset_id, report_id
 
         elif state == "Failed":
             raise HTTPException(
@@ -542,38 +723,229 @@ def upload_report(body: UploadRequest):
                 detail="Power BI import failed."
             )
 
-    # 🔥 NEW LOGIC ADDED: Disable SSO for DirectQuery (Service Principal Mapping)
-    if dataset_id:
-        datasources_url = f"{POWERBI_API}/groups/{body.workspace_id}/datasets/{dataset_id}/datasources"
-        ds_resp = requests.get(datasources_url, headers=headers)
-
-        if ds_resp.ok:
-            datasources = ds_resp.json().get("value", [])
-            if datasources:
-                gateway_id = datasources[0]["gatewayId"]
-                datasource_id = datasources[0]["datasourceId"]
-
-                patch_url = f"{POWERBI_API}/gateways/{gateway_id}/datasources/{datasource_id}"
-
-                patch_body = {
-                    "credentialDetails": {
-                        "credentialType": "OAuth2",
-                        "credentials": "{\"credentialData\":[]}",
-                        "encryptedConnection": "Encrypted",
-                        "encryptionAlgorithm": "None",
-                        "privacyLevel": "Organizational",
-                        "useEndUserOAuth2Credentials": False
-                    }
+    return None, None
+
+
+def store_upload_result(import_id: str, result: UploadResponse) -> None:
+    _UPLOAD_RESULTS[import_id] = result
+    _UPLOAD_RESULTS.move_to_end(import_id)
+
+    while len(_UPLOAD_RESULTS) > UPLOAD_RESULTS_MAX:
+        _UPLOAD_RESULTS.popitem(last=False)
+
+
+async def disable_sso(
+    client: httpx.AsyncClient, headers: dict, workspace_id: str, dataset_id: str
+) -> None:
+    """Disable SSO for DirectQuery (Service Principal Mapping)."""
+    datasources_url = f"{POWERBI_API}/groups/{workspace_id}/datasets/{dataset_id}/datasources"
+    ds_resp = await client.get(datasources_url, headers=headers)
+
+    if ds_resp.is_success:
+        datasources = orjson.loads(ds_resp.content).get("value", [])
+        if datasources:
+            gateway_id = datasources[0]["gatewayId"]
+            datasource_id = datasources[0]["datasourceId"]
+
+            patch_url = f"{POWERBI_API}/gateways/{gateway_id}/datasources/{datasource_id}"
+
+            patch_body = {
+                "credentialDetails": {
+                    "credentialType": "OAuth2",
+                    "credentials": "{\"credentialData\":[]}",
+                    "encryptedConnection": "Encrypted",
+                    "encryptionAlgorithm": "None",
+                    "privacyLevel": "Organizational",
+                    "useEndUserOAuth2Credentials": False
                 }
+            }
+
+            await client.patch(patch_url, headers=headers, json=patch_body)
+
+
+async def resolve_upload(
+    client: httpx.AsyncClient, headers: dict, body: UploadRequest, import_id: str
+) -> None:
+    """Background task: wait for the import to finish and record the outcome."""
+    try:
+        dataset_id, report_id = await fetch_import_result(
+            client, headers, body.workspace_id, import_id
+        )
+
+        if dataset_id:
+            await disable_sso(client, headers, body.workspace_id, dataset_id)
 
-                requests.patch(patch_url, headers=headers, json=patch_body)
+        # Out of poll budget is final too; don't leave it looking like the
+        # pending record start_upload stored
+        message = (
+            "Report uploaded successfully"
+            if dataset_id
+            else "Timed out waiting for Power BI import"
+        )
+
+    except HTTPException as e:
+        dataset_id = report_id = None
+        message = e.detail
 
-    return UploadResponse(
-        message="Report uploaded successfully"
-                if dataset_id
-                else "Upload processing still in progress",
+    except Exception as e:
+        dataset_id = report_id = None
+        message = f"Import status check failed: {str(e)}"
+
+    store_upload_result(import_id, UploadResponse(
+        message=message,
         workspace_id=body.workspace_id,
         report_name=body.report_name,
         report_id=report_id,
         dataset_id=dataset_id,
+        import_id=import_id,
+    ))
+
+
+async def run_concurrently(tasks: BackgroundTasks, limit: int) -> None:
+    semaphore = asyncio.Semaphore(limit)
+
+    async def run_one(task) -> None:
+        async with semaphore:
+            await task()
+
+    await asyncio.gather(*(run_one(task) for task in tasks.tasks))
+
+
+async def start_upload(
+    body: UploadRequest,
+    background: BackgroundTasks,
+    client: httpx.AsyncClient,
+    container: ContainerClient,
+) -> UploadResponse:
+    """Upload one report and schedule resolve_upload for its import."""
+    # 1️⃣ Authenticate and 2️⃣ download the template (served from cache when
+    # unchanged) concurrently; they hit independent endpoints
+    access_token, (pbix_size, pbix_content) = await asyncio.gather(
+        get_access_token(),
+        open_empty_pbix(container),
     )
+    headers = {"Authorization": f"Bearer {access_token}"}
+
+    # 3️⃣ Upload to Power BI (Import API)
+    upload_url = (
+        f"{POWERBI_API}/groups/{body.workspace_id}/imports"
+        f"?datasetDisplayName={quote(body.report_name, safe='')}"
+        "&nameConflict=CreateOrOverwrite"
+    )
+
+    # The multipart envelope is streamed around the template, never copied
+    multipart_headers, multipart_body = multipart_file_stream(
+        f"{body.report_name}.pbix",
+        PBIX_CONTENT_TYPE,
+        pbix_size,
+        pbix_content,
+    )
+
+    try:
+        resp = await client.post(
+            upload_url,
+            headers={**headers, **multipart_headers},
+            content=multipart_body,
+        )
+    finally:
+        # Stops a template download the upload abandoned (no-op once drained)
+        await multipart_body.aclose()
+
+    if resp.status_code not in (200, 201, 202):
+        raise HTTPException(status_code=resp.status_code, detail=error_detail(resp))
+
+    import_data = orjson.loads(resp.content)
+    import_id = import_data.get("id")
+
+    if not import_id:
+        raise HTTPException(
+            status_code=500,
+            detail="Import ID not returned from Power BI."
+        )
+
+    # 4️⃣ Resolve the report ID after responding; clients poll
+    # GET /upload-report/{import_id} for the outcome
+    result = UploadResponse(
+        message="Upload processing still in progress",
+        workspace_id=body.workspace_id,
+        report_name=body.report_name,
+        import_id=import_id,
+    )
+    store_upload_result(import_id, result)
+    background.add_task(resolve_upload, client, headers, body, import_id)
+
+    return result
+
+
+@app.get("/", tags=["Health"])
+def root():
+    return {
+        "status": "ok",
+        "message": "Power BI Report Uploader is running. Visit /docs to use the API."
+    }
+
+
+@app.post("/upload-report", response_model=UploadResponse, status_code=202, tags=["Power BI"])
+async def upload_report(
+    body: UploadRequest,
+    background: BackgroundTasks,
+    client: httpx.AsyncClient = Depends(get_http_client),
+    container: ContainerClient = Depends(get_blob_container),
+):
+    return await start_upload(body, background, client, container)
+
+
+@app.post("/upload-reports", response_model=BatchUploadResponse, status_code=202, tags=["Power BI"])
+async def upload_reports(
+    body: BatchUploadRequest,
+    background: BackgroundTasks,
+    client: httpx.AsyncClient = Depends(get_http_client),
+    container: ContainerClient = Depends(get_blob_container),
+):
+    # Fan the uploads out, bounded so a large batch can't flood Power BI
+    semaphore = asyncio.Semaphore(BATCH_UPLOAD_CONCURRENCY)
+    # Starlette runs background tasks one after another; collect the per-import
+    # pollers here so they can be run side by side (under the same bound) instead
+    pollers = BackgroundTasks()
+
+    async def upload_one(report: UploadRequest) -> UploadResponse:
+        async with semaphore:
+            return await start_upload(report, pollers, client, container)
+
+    outcomes = await asyncio.gather(
+        *(upload_one(report) for report in body.reports),
+        return_exceptions=True,
+    )
+
+    results = []
+    for report, outcome in zip(body.reports, outcomes):
+        if isinstance(outcome, Exception):
+            detail = outcome.detail if isinstance(outcome, HTTPException) else str(outcome)
+            outcome = UploadResponse(
+                message=f"Upload failed: {detail}",
+                workspace_id=report.workspace_id,
+                report_name=report.report_name,
+            )
+        results.append(outcome)
+
+    background.add_task(run_concurrently, pollers, BATCH_UPLOAD_CONCURRENCY)
+
+    return BatchUploadResponse(results=results)
+
+
+@app.get("/upload-report/{import_id}", response_model=UploadResponse, tags=["Power BI"])
+async def get_upload_status(import_id: str):
+    result = _UPLOAD_RESULTS.get(import_id)
+
+    if result is None:
+        raise HTTPException(
+            status_code=404,
+            detail="Unknown import ID."
+        )
+
+    return result
+
+
+if __name__ == "__main__":
+    # uvloop's libuv loop and the C httptools parser cut per-await overhead
+    uvicorn.run("main:app", host="0.0.0.0", port=8000, loop="uvloop", http="httptools")
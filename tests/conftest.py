@@ -0,0 +1,9 @@
+import os
+import sys
+
+# main.py validates its settings at import; give it a complete dummy config
+for name in ("TENANT_ID", "CLIENT_ID", "CLIENT_SECRET",
+             "AZURE_STORAGE_CONNECTION_STRING", "BLOB_CONTAINER", "EMPTY_PBIX_NAME"):
+    os.environ.setdefault(name, f"test-{name.lower()}")
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
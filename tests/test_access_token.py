@@ -0,0 +1,44 @@
+import asyncio
+import threading
+
+import main
+
+
+def reset_token_state(monkeypatch, acquire):
+    monkeypatch.setattr(main, "_ACCESS_TOKEN", None)
+    monkeypatch.setattr(main, "_TOKEN_LOCK", asyncio.Lock())
+    monkeypatch.setattr(main, "acquire_token_for_client", acquire)
+
+
+def test_concurrent_cold_requests_share_one_token_call(monkeypatch):
+    calls = []
+    lock = threading.Lock()
+
+    def acquire():
+        with lock:
+            calls.append(1)
+        return {"access_token": "tok", "expires_in": 3600}
+
+    async def run():
+        reset_token_state(monkeypatch, acquire)
+        tokens = await asyncio.gather(*(main.get_access_token() for _ in range(10)))
+        assert tokens == ["tok"] * 10
+        # Warm: served from the cached token without touching MSAL
+        assert await main.get_access_token() == "tok"
+
+    asyncio.run(run())
+    assert len(calls) == 1
+
+
+def test_expired_token_is_refreshed(monkeypatch):
+    results = iter([
+        {"access_token": "old", "expires_in": 0},
+        {"access_token": "new", "expires_in": 3600},
+    ])
+
+    async def run():
+        reset_token_state(monkeypatch, lambda: next(results))
+        assert await main.get_access_token() == "old"
+        assert await main.get_access_token() == "new"
+
+    asyncio.run(run())
@@ -0,0 +1,33 @@
+import asyncio
+
+import pytest
+from fastapi import BackgroundTasks
+from pydantic import ValidationError
+
+import main
+
+
+def test_batch_size_is_capped():
+    report = {"workspace_id": "ws", "report_name": "Report"}
+
+    main.BatchUploadRequest(reports=[report] * main.BATCH_MAX_REPORTS)
+    with pytest.raises(ValidationError):
+        main.BatchUploadRequest(reports=[report] * (main.BATCH_MAX_REPORTS + 1))
+
+
+def test_pollers_run_under_the_limit():
+    running = peak = 0
+
+    async def poll():
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+
+    pollers = BackgroundTasks()
+    for _ in range(10):
+        pollers.add_task(poll)
+
+    asyncio.run(main.run_concurrently(pollers, 3))
+    assert peak == 3
@@ -0,0 +1,10 @@
+from pathlib import Path
+
+from config import Settings
+
+
+def test_env_file_is_resolved_next_to_config_not_the_cwd():
+    env_file = Path(Settings.model_config["env_file"])
+
+    assert env_file.is_absolute()
+    assert env_file == Path(__file__).resolve().parent.parent / ".env"
@@ -0,0 +1,223 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+from fastapi import BackgroundTasks, HTTPException
+
+import main
+
+CHUNK = 4
+TEMPLATE = b"0123456789abcdefghijklmnopqrstuvwxyz"  # 9 ranges of 4 bytes
+
+
+class FakeDownload:
+    def __init__(self, data):
+        self.data = data
+
+    async def readall(self):
+        return self.data
+
+
+class FakeBlob:
+    def __init__(self, data=TEMPLATE, etag="etag-1", fail_at=None, error=RuntimeError("boom")):
+        self.data = data
+        self.etag = etag
+        self.fail_at = fail_at
+        self.error = error
+        self.range_calls = 0
+        self.cancelled = 0
+
+    async def get_blob_properties(self):
+        return SimpleNamespace(etag=self.etag, size=len(self.data))
+
+    async def download_blob(self, offset, length, etag, match_condition):
+        self.range_calls += 1
+        try:
+            await asyncio.sleep(0.001)
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        if offset == self.fail_at:
+            raise self.error
+        return FakeDownload(self.data[offset:offset + length])
+
+
+class FakeContainer:
+    def __init__(self, blob):
+        self.blob = blob
+
+    def get_blob_client(self, name):
+        return self.blob
+
+
+@pytest.fixture(autouse=True)
+def pipeline_state(monkeypatch):
+    monkeypatch.setattr(main, "PBIX_CHUNK_SIZE", CHUNK)
+    monkeypatch.setattr(main, "PBIX_PIPELINE_SLOTS", 2)
+    monkeypatch.setattr(main, "PBIX_DOWNLOAD_CONCURRENCY", 3)
+    monkeypatch.setattr(main, "_PBIX_CACHE", None)
+    monkeypatch.setattr(main, "_PBIX_LOCK", asyncio.Lock())
+
+
+async def read_all(content):
+    if isinstance(content, bytes):
+        return content
+    return b"".join([chunk async for chunk in content])
+
+
+def test_miss_streams_template_in_order_and_fills_cache():
+    blob = FakeBlob()
+
+    async def run():
+        size, content = await main.open_empty_pbix(FakeContainer(blob))
+        assert size == len(TEMPLATE)
+        assert await read_all(content) == TEMPLATE
+
+        assert main._PBIX_CACHE == ("etag-1", TEMPLATE)
+        assert not main._PBIX_LOCK.locked()
+
+        # Warm: served from the cache without downloading again
+        size, content = await main.open_empty_pbix(FakeContainer(blob))
+        assert content == TEMPLATE
+
+    asyncio.run(run())
+    assert blob.range_calls == 9
+
+
+def test_concurrent_misses_download_once():
+    blob = FakeBlob()
+
+    async def run():
+        opened = await asyncio.gather(*(main.open_empty_pbix(FakeContainer(blob)) for _ in range(3)))
+        bodies = await asyncio.gather(*(read_all(content) for _, content in opened))
+        assert bodies == [TEMPLATE] * 3
+
+    asyncio.run(run())
+    assert blob.range_calls == 9
+
+
+def test_unread_stream_holds_no_lock():
+    # e.g. the token call failed after the template was opened
+    blob = FakeBlob()
+
+    async def run():
+        await main.open_empty_pbix(FakeContainer(blob))
+        assert not main._PBIX_LOCK.locked()
+
+        _, content = await main.open_empty_pbix(FakeContainer(blob))
+        assert await asyncio.wait_for(read_all(content), 1) == TEMPLATE
+
+    asyncio.run(run())
+
+
+def test_closing_a_partly_read_stream_cancels_the_download():
+    blob = FakeBlob()
+
+    async def run():
+        _, content = await main.open_empty_pbix(FakeContainer(blob))
+        assert await content.__anext__() == TEMPLATE[:CHUNK]
+        await content.aclose()
+
+        assert not main._PBIX_LOCK.locked()
+        assert main._PBIX_CACHE is None
+
+    asyncio.run(run())
+    assert blob.range_calls < 9 or blob.cancelled
+
+
+def test_slow_consumer_gets_the_whole_template():
+    # The download must wait on backpressure, not give up and strand the reader
+    blob = FakeBlob()
+
+    async def run():
+        _, content = await main.open_empty_pbix(FakeContainer(blob))
+        chunks = []
+        async for chunk in content:
+            await asyncio.sleep(0.02)
+            chunks.append(chunk)
+
+        assert b"".join(chunks) == TEMPLATE
+        assert not main._PBIX_LOCK.locked()
+        assert main._PBIX_CACHE == ("etag-1", TEMPLATE)
+
+    asyncio.run(asyncio.wait_for(run(), 5))
+
+
+@pytest.mark.parametrize("error", [RuntimeError("boom"), asyncio.TimeoutError()])
+def test_range_failure_surfaces_in_the_body(error):
+    blob = FakeBlob(fail_at=8, error=error)
+
+    async def run():
+        _, content = await main.open_empty_pbix(FakeContainer(blob))
+        with pytest.raises(HTTPException) as exc:
+            await asyncio.wait_for(read_all(content), 1)
+
+        assert exc.value.detail.startswith("Blob download failed")
+        assert not main._PBIX_LOCK.locked()
+        assert main._PBIX_CACHE is None
+
+    asyncio.run(run())
+
+
+class FakeResponse:
+    def __init__(self, status_code, content):
+        self.status_code = status_code
+        self.content = content
+
+
+class FakeClient:
+    """Reads `reads` body chunks, then fails or answers with `status_code`."""
+
+    def __init__(self, reads, status_code=None):
+        self.reads = reads
+        self.status_code = status_code
+
+    async def post(self, url, headers, content):
+        for _ in range(self.reads):
+            await content.__anext__()
+        if self.status_code is None:
+            raise ConnectionError("connection reset")
+        return FakeResponse(self.status_code, b"<html>proxy error</html>")
+
+
+@pytest.mark.parametrize("client", [
+    FakeClient(reads=0),
+    FakeClient(reads=3),
+    FakeClient(reads=3, status_code=413),
+])
+def test_failed_upload_releases_the_template_lock(monkeypatch, client):
+    blob = FakeBlob()
+
+    async def token():
+        return "tok"
+
+    monkeypatch.setattr(main, "get_access_token", token)
+    request = main.UploadRequest(workspace_id="ws", report_name="Report")
+
+    async def run():
+        with pytest.raises((ConnectionError, HTTPException)):
+            await main.start_upload(request, BackgroundTasks(), client, FakeContainer(blob))
+
+        assert not main._PBIX_LOCK.locked()
+
+        # The next miss is not stuck behind the abandoned download
+        _, content = await main.open_empty_pbix(FakeContainer(blob))
+        assert await asyncio.wait_for(read_all(content), 1) == TEMPLATE
+
+    asyncio.run(run())
+
+
+def test_multipart_filename_cannot_inject_headers():
+    headers, body = main.multipart_file_stream(
+        'A\r\nX-Evil: 1\r\n"B\\.pbix', main.PBIX_CONTENT_TYPE, len(TEMPLATE), TEMPLATE
+    )
+
+    async def run():
+        return await read_all(body)
+
+    payload = asyncio.run(run())
+    part_headers = payload.split(b"\r\n\r\n", 1)[0]
+
+    assert b'filename="A%0D%0AX-Evil: 1%0D%0A%22B\\\\.pbix"' in part_headers
+    assert b"\r\nX-Evil" not in part_headers
+    assert int(headers["Content-Length"]) == len(payload)
@@ -0,0 +1,17 @@
+import asyncio
+
+import main
+
+
+def test_exhausted_poll_budget_is_not_reported_as_pending(monkeypatch):
+    async def never_finishes(client, headers, workspace_id, import_id):
+        return None, None
+
+    monkeypatch.setattr(main, "fetch_import_result", never_finishes)
+    request = main.UploadRequest(workspace_id="ws", report_name="Report")
+
+    asyncio.run(main.resolve_upload(None, {}, request, "import-1"))
+
+    result = main._UPLOAD_RESULTS["import-1"]
+    assert result.message == "Timed out waiting for Power BI import"
+    assert result.message != "Upload processing still in progress"
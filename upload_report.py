@@ -9,36 +9,39 @@ Auth uses client credentials (service principal) flow — no browser/session nee
 """
 
 import argparse
+import random
 import time
 import sys
-import requests
+import niquests
+from requests_toolbelt.multipart.encoder import MultipartEncoder
 import msal
+import orjson
 from azure.storage.blob import BlobServiceClient
-from dotenv import load_dotenv
-import os
-
-load_dotenv()
-
-# ── Config (loaded from .env or environment variables) ───────────────────────
-TENANT_ID      = os.getenv("TENANT_ID")
-CLIENT_ID      = os.getenv("CLIENT_ID")
-CLIENT_SECRET  = os.getenv("CLIENT_SECRET")
-
-AZURE_STORAGE_CONNECTION_STRING = os.getenv("AZURE_STORAGE_CONNECTION_STRING")
-BLOB_CONTAINER  = os.getenv("BLOB_CONTAINER")
-EMPTY_PBIX_NAME = os.getenv("EMPTY_PBIX_NAME")
+from pydantic import ValidationError
+from urllib.parse import quote
+from config import Settings
 
+# ── Config (credentials come from .env or environment variables, see config.py)
 POWERBI_SCOPE = ["https://analysis.windows.net/powerbi/api/.default"]
 POWERBI_API   = "https://api.powerbi.com/v1.0/myorg"
+
+ERROR_DETAIL_LIMIT = 512
+
+# Range size for the template download; below the SDK's 32 MiB default single
+# GET so max_concurrency actually fetches ranges in parallel
+PBIX_CHUNK_SIZE = 4 * 1024 * 1024
 # ─────────────────────────────────────────────────────────────────────────────
 
+# Keep-alive HTTP/2 session so the polling GETs reuse the upload's connection.
+session = niquests.Session()
+
 
-def get_access_token() -> str:
+def get_access_token(settings: Settings) -> str:
     """Obtain a Power BI access token via service principal (client credentials)."""
     app = msal.ConfidentialClientApplication(
-        CLIENT_ID,
-        authority=f"https://login.microsoftonline.com/{TENANT_ID}",
-        client_credential=CLIENT_SECRET,
+        settings.client_id,
+        authority=f"https://login.microsoftonline.com/{settings.tenant_id}",
+        client_credential=settings.client_secret,
     )
     result = app.acquire_token_for_client(scopes=POWERBI_SCOPE)
     if "access_token" not in result:
@@ -48,53 +51,80 @@ def get_access_token() -> str:
     return result["access_token"]
 
 
-def download_empty_pbix() -> bytes:
+def download_empty_pbix(settings: Settings) -> bytes:
     """Download the empty .pbix template from Azure Blob Storage."""
-    blob_service = BlobServiceClient.from_connection_string(AZURE_STORAGE_CONNECTION_STRING)
-    container    = blob_service.get_container_client(BLOB_CONTAINER)
-    blob         = container.get_blob_client(EMPTY_PBIX_NAME)
-    data         = blob.download_blob().readall()
-    print(f"✓ Downloaded '{EMPTY_PBIX_NAME}' from blob ({len(data):,} bytes).")
+    blob_service = BlobServiceClient.from_connection_string(
+        settings.azure_storage_connection_string,
+        max_single_get_size=PBIX_CHUNK_SIZE,
+        max_chunk_get_size=PBIX_CHUNK_SIZE,
+    )
+    container    = blob_service.get_container_client(settings.blob_container)
+    blob         = container.get_blob_client(settings.empty_pbix_name)
+    data         = blob.download_blob(max_concurrency=8).readall()
+    print(f"✓ Downloaded '{settings.empty_pbix_name}' from blob ({len(data):,} bytes).")
     return data
 
 
-def upload_to_workspace(access_token: str, workspace_id: str, report_name: str, pbix_bytes: bytes) -> dict:
-    """Upload the .pbix to the specified Power BI workspace."""
+def upload_to_workspace(access_token: str, workspace_id: str, report_name: str, pbix_bytes: bytes) -> tuple[dict, str]:
+    """Upload the .pbix to the specified Power BI workspace; returns (headers, import_id)."""
     headers = {"Authorization": f"Bearer {access_token}"}
 
     upload_url = (
         f"{POWERBI_API}/groups/{workspace_id}/imports"
-        f"?datasetDisplayName={report_name}"
+        f"?datasetDisplayName={quote(report_name, safe='')}"
         "&nameConflict=CreateOrOverwrite"
     )
 
-    files = {
+    # Streams the multipart body instead of concatenating it into one big bytes object
+    encoder = MultipartEncoder(fields={
         "file": (f"{report_name}.pbix", pbix_bytes, "application/vnd.ms-powerbi.pbix")
-    }
+    })
 
     print(f"↑ Uploading report '{report_name}' to workspace {workspace_id} ...")
-    resp = requests.post(upload_url, headers=headers, files=files)
+    resp = session.post(
+        upload_url,
+        headers={**headers, "Content-Type": encoder.content_type},
+        data=encoder,
+    )
 
     if resp.status_code not in (200, 201, 202):
-        print(f"ERROR: Upload failed ({resp.status_code}): {resp.text}")
+        detail = resp.content[:ERROR_DETAIL_LIMIT].decode("utf-8", "replace")
+        print(f"ERROR: Upload failed ({resp.status_code}): {detail}")
+        sys.exit(1)
+
+    import_id = orjson.loads(resp.content).get("id")
+    if not import_id:
+        print("ERROR: Import ID not returned from Power BI.")
         sys.exit(1)
 
     print(f"✓ Upload accepted (HTTP {resp.status_code}). Waiting for Power BI to process...")
-    return headers
+    return headers, import_id
+
+
+def poll_delays(attempts: int):
+    """Exponential backoff with jitter: ~0.5s, 0.85s, 1.4s, ... capped at 5s."""
+    delay = 0.5
+    for _ in range(attempts):
+        yield delay + random.uniform(0, delay * 0.25)
+        delay = min(delay * 1.7, 5.0)
 
 
-def fetch_report_id(headers: dict, workspace_id: str, report_name: str) -> str | None:
-    """Poll the workspace reports list to find the newly uploaded report's ID."""
-    reports_url = f"{POWERBI_API}/groups/{workspace_id}/reports"
+def fetch_report_id(headers: dict, workspace_id: str, import_id: str) -> str | None:
+    """Poll the import's status until Power BI reports the new report's ID."""
+    import_status_url = f"{POWERBI_API}/groups/{workspace_id}/imports/{import_id}"
 
-    for attempt in range(8):
-        time.sleep(3)
-        resp = requests.get(reports_url, headers=headers)
+    for attempt, delay in enumerate(poll_delays(10)):
+        time.sleep(delay)
+        resp = session.get(import_status_url, headers=headers)
         if resp.ok:
-            for report in resp.json().get("value", []):
-                if report["name"].lower() == report_name.lower():
-                    return report["id"]
-        print(f"  Attempt {attempt + 1}: report not found yet, retrying...")
+            status = orjson.loads(resp.content)
+            state = status.get("importState")
+            if state == "Succeeded" and status.get("reports"):
+                return status["reports"][0]["id"]
+            if state == "Failed":
+                print("ERROR: Power BI import failed.")
+                sys.exit(1)
+        print(f"  Attempt {attempt + 1}: import still processing, retrying...")
 
     return None
 
@@ -106,17 +136,17 @@ def main():
     args = parser.parse_args()
 
     # Validate required env vars
-    missing = [v for v in ["TENANT_ID", "CLIENT_ID", "CLIENT_SECRET",
-                            "AZURE_STORAGE_CONNECTION_STRING", "BLOB_CONTAINER", "EMPTY_PBIX_NAME"]
-               if not os.getenv(v)]
-    if missing:
+    try:
+        settings = Settings()
+    except ValidationError as e:
+        missing = [str(err["loc"][0]).upper() for err in e.errors()]
         print("ERROR: Missing environment variables:", ", ".join(missing))
         sys.exit(1)
 
-    token      = get_access_token()
-    pbix_bytes = download_empty_pbix()
-    headers    = upload_to_workspace(token, args.workspace_id, args.report_name, pbix_bytes)
-    report_id  = fetch_report_id(headers, args.workspace_id, args.report_name)
+    token      = get_access_token(settings)
+    pbix_bytes = download_empty_pbix(settings)
+    headers, import_id = upload_to_workspace(token, args.workspace_id, args.report_name, pbix_bytes)
+    report_id  = fetch_report_id(headers, args.workspace_id, import_id)
 
     if report_id:
         print(f"\n✅ Success!")